@@ -0,0 +1,63 @@
+import asyncio
+import json
+from collections import deque
+from datetime import datetime
+from typing import Awaitable, Callable, Deque, Optional
+
+from .player import Player
+
+
+class Chat:
+    def __init__(self, history_size: int = 50, flush_interval: float = 0.1, max_message_length: int = 200):
+        self.history: Deque[dict] = deque(maxlen=history_size)
+        self.pending: Deque[dict] = deque(maxlen=history_size)
+        self.flush_interval = flush_interval
+        self.max_message_length = max_message_length
+        self.flush_task: Optional[asyncio.Task] = None
+
+    def add_message(self, player: Player, text: str) -> Optional[dict]:
+        text = str(text).strip()[:self.max_message_length]
+        if not text:
+            return None
+        message = {
+            "player_id": player.id,
+            "nick": player.nick,
+            "message": text,
+            "timestamp": datetime.now().isoformat(),
+        }
+        self.history.append(message)
+        self.pending.append(message)
+        return message
+
+    def get_history_frame(self, last_n: Optional[int] = None) -> Optional[str]:
+        if not self.history:
+            return None
+        messages = list(self.history)
+        if last_n is not None:
+            messages = messages[-last_n:]
+        return json.dumps({"chat_history": messages})
+
+    def pop_pending_frame(self) -> Optional[str]:
+        if not self.pending:
+            return None
+        frame = json.dumps({"chat": list(self.pending)})
+        self.pending.clear()
+        return frame
+
+    def schedule_flush(self, send_to_all: Callable[[str], Awaitable[None]]):
+        if self.flush_task is None or self.flush_task.done():
+            self.flush_task = asyncio.ensure_future(self.flush_later(send_to_all))
+
+    async def flush_later(self, send_to_all: Callable[[str], Awaitable[None]]):
+        await asyncio.sleep(self.flush_interval)
+        frame = self.pop_pending_frame()
+        while frame is not None:
+            await send_to_all(frame)
+            frame = self.pop_pending_frame()
+
+    def clear(self):
+        self.history.clear()
+        self.pending.clear()
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+            self.flush_task = None
@@ -1,3 +1,5 @@
+import time
+
 from starlette.websockets import WebSocket
 
 from app.player import Player
@@ -6,4 +8,9 @@ from app.player import Player
 class Connection:
     def __init__(self, ws: WebSocket, player: Player):
         self.ws = ws
-        self.player = player
\ No newline at end of file
+        self.player = player
+        self.last_seen = time.monotonic()
+        self.answers_pings = False
+
+    def mark_alive(self):
+        self.last_seen = time.monotonic()
@@ -1,24 +1,55 @@
+import asyncio
 import json
+from typing import Dict, List, Optional
 
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
 from app.connection import Connection
-from app.models import PlayerGuess
+from app.leaderboard import Leaderboard
+from app.logger import setup_custom_logger
+from app.models import PlayerGuess, GuessStatus
 from app.player import Player
+from app.rate_limit import RateLimiter
 from app.room import Room
-from app.server_errors import PlayerIdAlreadyInUse, NoRoomWithThisId, RoomIdAlreadyInUse
+from app.server_errors import PlayerIdAlreadyInUse, NoRoomWithThisId, RoomIdAlreadyInUse, RateLimitExceeded, \
+    NoPlayerWithThisId
+from app.skip_list import IndexableSkipList
+from app.stats import ServerStats
+
+logger = setup_custom_logger("connection_manager")
 
 
 class ConnectionManager:
     def __init__(self):
-        self.rooms = [Room(room_id="1", locale="pl")]
+        self.stats = ServerStats()
+        self.rooms: Dict[str, Room] = {}
+        self.room_seqs: Dict[str, int] = {}
+        self.rooms_by_seq: Dict[int, Room] = {}
+        self.room_index = IndexableSkipList()
+        self.locale_indexes: Dict[str, IndexableSkipList] = {}
+        self.next_room_seq = 0
+        self.max_scan_factor = 10
+        self.throttled_frame_delay = 0.1
+        self.add_room(Room(room_id="1", locale="pl", stats=self.stats))
+        self.rate_limiter = RateLimiter()
+        self.leaderboard = Leaderboard()
 
     def get_room(self, room_id):
         try:
-            return next(r for r in self.rooms if r.id == room_id)
-        except StopIteration:
+            return self.rooms[room_id]
+        except KeyError:
             raise NoRoomWithThisId
 
+    def add_room(self, room: Room):
+        seq = self.next_room_seq
+        self.next_room_seq += 1
+        self.rooms[room.id] = room
+        self.room_seqs[room.id] = seq
+        self.rooms_by_seq[seq] = room
+        self.room_index.insert(seq)
+        self.locale_indexes.setdefault(room.locale, IndexableSkipList()).insert(seq)
+        self.stats.room_created(room.locale)
+
     async def restart_game(self, room_id: str):
         room = self.get_room(room_id)
         await room.restart_game()
@@ -32,7 +63,7 @@ class ConnectionManager:
         await room.end_game()
 
     async def end_all_games(self):
-        for room in self.rooms:
+        for room in list(self.rooms.values()):
             await room.end_game()
 
     async def connect(self, websocket: WebSocket, room_id: str, client_id: str, nick: str):
@@ -43,42 +74,104 @@ class ConnectionManager:
         room = self.get_room(room_id)
         await websocket.send_text(room.get_game_state(client_id))
         await websocket.send_bytes(room.game_data)
+        chat_history = room.chat.get_history_frame()
+        if chat_history is not None:
+            await websocket.send_text(chat_history)
+        return connection
 
     async def append_connection(self, room_id, connection):
         room = self.get_room(room_id)
         await room.append_connection(connection)
 
     async def disconnect(self, websocket: WebSocket):
-        connection_with_given_ws, room = self.get_active_connection(websocket)
+        active_connection = self.get_active_connection(websocket)
+        if active_connection is None:
+            return
+        connection_with_given_ws, room = active_connection
+        self.rate_limiter.forget_player(room.id, connection_with_given_ws.player.id)
         await room.remove_connection(connection_with_given_ws)
 
+    async def reap_connection(self, room: Room, connection: Connection, close_timeout: float = 5):
+        if connection not in room.active_connections:
+            return
+        self.stats.connection_reaped()
+        room.reaped_connections += 1
+        self.rate_limiter.forget_player(room.id, connection.player.id)
+        await room.remove_connection(connection)
+        try:
+            await asyncio.wait_for(connection.ws.close(code=1001), timeout=close_timeout)
+        except Exception as e:
+            logger.info(f"failed to close reaped connection {connection.player.id}: {e.__class__.__name__}")
+
     async def broadcast(self, room_id):
         room = self.get_room(room_id)
         for connection in room.active_connections:
             await connection.ws.send_bytes(room.game_data)
 
+    def schedule_frame_broadcast(self, room: Room):
+        if room.frame_broadcast_task is None or room.frame_broadcast_task.done():
+            room.frame_broadcast_task = asyncio.ensure_future(self.broadcast_latest_frame(room))
+
+    async def broadcast_latest_frame(self, room: Room):
+        await asyncio.sleep(self.throttled_frame_delay)
+        if self.rooms.get(room.id) is room:
+            await self.broadcast(room.id)
+
     async def handle_ws_message(self, message: dict, room_id, client_id):
         self.handle_disconnect_message(message)
         room = self.get_room(room_id)
         try:
-            if client_id == room.whos_turn:
+            text_message = json.loads(message['text']) if message.get('text') is not None else None
+            if isinstance(text_message, dict) and 'pong' in text_message:
+                room.get_connection(client_id).answers_pings = True
+                return
+            message_type = self.get_message_type(message, text_message)
+            if message_type != 'chat' and client_id != room.whos_turn:
+                return
+            if message_type == 'frame':
+                room.game_data = message['bytes']
+            if not self.rate_limiter.allow(room_id, client_id, message_type):
+                if message_type == 'frame':
+                    self.schedule_frame_broadcast(room)
+                return
+            if message_type == 'chat':
+                await room.handle_chat_message(client_id, text_message['chat'])
+            elif client_id == room.whos_turn:
                 if 'bytes' in message:
                     room.game_data = message['bytes']
-                elif 'text' in message:
-                    await room.handle_text_message(json.loads(message['text']))
+                elif text_message is not None:
+                    await room.handle_text_message(text_message)
                 else:
                     print("other")
                     print(message)
                 await self.broadcast(room_id)
-        except KeyError as e:
+        except (KeyError, ValueError, NoPlayerWithThisId) as e:
             print(e)
 
+    @staticmethod
+    def get_message_type(message: dict, text_message) -> str:
+        if text_message is None:
+            return 'frame' if 'bytes' in message else 'other'
+        if isinstance(text_message, dict):
+            if 'chat' in text_message:
+                return 'chat'
+            if 'other_move' in text_message:
+                return 'other_move'
+        return 'text'
+
     async def handle_players_guess(self, player_guess: PlayerGuess):
         room = self.get_room(player_guess.room_id)
-        return await room.handle_players_guess(player_guess)
+        room.get_connection(player_guess.player_id).mark_alive()
+        if not self.rate_limiter.allow(room.id, player_guess.player_id, 'guess'):
+            raise RateLimitExceeded
+        result = await room.handle_players_guess(player_guess)
+        if result.status == GuessStatus.win and result.points:
+            self.leaderboard.add_points(result.winner, room.get_player_nick(result.winner), result.points)
+            self.leaderboard.add_points(result.drawer, room.get_player_nick(result.drawer), result.drawer_points)
+        return result
 
     def get_active_connection(self, websocket: WebSocket):
-        for r in self.rooms:
+        for r in self.rooms.values():
             for connection in r.active_connections:
                 if connection.ws == websocket:
                     return connection, r
@@ -86,6 +179,7 @@ class ConnectionManager:
     async def kick_player(self, room_id, player_id):
         room = self.get_room(room_id)
         await room.kick_player(player_id)
+        self.rate_limiter.forget_player(room_id, player_id)
 
     def validate_client_id(self, room_id: str, client_id: str):
         room = self.get_room(room_id)
@@ -97,18 +191,61 @@ class ConnectionManager:
         return room.get_stats()
 
     def get_overall_stats(self):
-        return {'rooms_count': len(self.rooms),
-                'rooms_ids': [r.id for r in self.rooms]}
+        stats = self.stats.get_stats()
+        stats['rooms_ids'] = list(self.rooms)
+        return stats
+
+    def get_rooms_stats(self, room_ids: List[str]):
+        return {room_id: self.rooms[room_id].get_stats() if room_id in self.rooms else None
+                for room_id in room_ids}
+
+    def list_rooms(self, cursor: Optional[str] = None, limit: int = 50, locale: Optional[str] = None,
+                   is_game_on: Optional[bool] = None, min_players: Optional[int] = None,
+                   max_players: Optional[int] = None):
+        index = self.locale_indexes.get(locale) if locale else self.room_index
+        rooms = []
+        next_cursor = None
+        if index is None or limit <= 0:
+            return {"rooms": rooms, "next_cursor": next_cursor}
+        scanned = 0
+        for seq in index.iter_after(int(cursor) if cursor else -1):
+            room = self.rooms_by_seq[seq]
+            scanned += 1
+            players_count = len(room.active_connections)
+            if (is_game_on is None or room.is_game_on == is_game_on) \
+                    and (min_players is None or players_count >= min_players) \
+                    and (max_players is None or players_count <= max_players):
+                rooms.append(room.get_summary())
+            if len(rooms) >= limit or scanned >= limit * self.max_scan_factor:
+                next_cursor = str(seq)
+                break
+        return {"rooms": rooms, "next_cursor": next_cursor}
+
+    def get_leaderboard(self, room_id: Optional[str] = None, count: int = 10, player_id: Optional[str] = None):
+        leaderboard = self.get_room(room_id).leaderboard if room_id else self.leaderboard
+        return leaderboard.get_stats(count, player_id)
+
+    def get_rate_limit_stats(self):
+        return self.rate_limiter.get_stats()
 
     async def create_new_room(self, room_id, locale: str = 'pl'):
-        if room_id not in [room.id for room in self.rooms]:
-            self.rooms.append(Room(room_id=room_id, locale=locale))
+        if room_id not in self.rooms:
+            self.add_room(Room(room_id=room_id, locale=locale, stats=self.stats))
         else:
             raise RoomIdAlreadyInUse
 
     async def delete_room(self, room_id):
         room = self.get_room(room_id)
-        self.rooms.remove(room)
+        room.chat.clear()
+        self.rate_limiter.forget_room(room_id)
+        seq = self.room_seqs.pop(room_id)
+        del self.rooms[room_id]
+        del self.rooms_by_seq[seq]
+        self.room_index.remove(seq)
+        self.locale_indexes[room.locale].remove(seq)
+        room.timer.cancel()
+        self.stats.room_deleted(room.locale, len(room.active_connections), room.is_game_on)
+        room.stats = ServerStats()
 
     def handle_disconnect_message(self, message: dict):
         # {'type': 'websocket.disconnect', 'code': 1001}
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import time
+from typing import Optional
+
+from .logger import setup_custom_logger
+
+logger = setup_custom_logger("heartbeat")
+
+
+class Heartbeat:
+    """One shared task that pings every connection and reaps the ones that stopped answering.
+
+    The deadline only applies to connections that have answered at least one ping; older clients
+    are reaped only when a ping cannot be sent.
+    """
+
+    def __init__(self, manager, interval: float = 15, deadline: float = 0, send_timeout: float = 5):
+        self.manager = manager
+        self.interval = interval
+        self.deadline = deadline
+        self.send_timeout = send_timeout
+        self.seq = 0
+        self.pings_sent = 0
+        self.failed_pings = 0
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self.interval > 0 and self.task is None:
+            self.task = asyncio.ensure_future(self.run())
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.info(f"heartbeat tick failed: {e.__class__.__name__}: {e}")
+
+    async def tick(self):
+        now = time.monotonic()
+        self.seq += 1
+        ping = json.dumps({"ping": self.seq})
+        to_ping = []
+        to_reap = []
+        for room in list(self.manager.rooms.values()):
+            for connection in list(room.active_connections):
+                if self.deadline and connection.answers_pings and now - connection.last_seen > self.deadline:
+                    to_reap.append((room, connection))
+                else:
+                    to_ping.append((room, connection))
+
+        results = await asyncio.gather(*(self.send_ping(connection, ping) for _, connection in to_ping))
+        for (room, connection), sent in zip(to_ping, results):
+            if not sent:
+                to_reap.append((room, connection))
+
+        for room, connection in to_reap:
+            logger.info(f"reaping connection {connection.player.id} in room {room.id}")
+            await self.manager.reap_connection(room, connection)
+
+    async def send_ping(self, connection, ping: str) -> bool:
+        try:
+            await asyncio.wait_for(connection.ws.send_text(ping), timeout=self.send_timeout)
+            self.pings_sent += 1
+            return True
+        except Exception:
+            self.failed_pings += 1
+            return False
+
+    def get_stats(self):
+        return {"interval": self.interval,
+                "deadline": self.deadline,
+                "pings_sent": self.pings_sent,
+                "failed_pings": self.failed_pings}
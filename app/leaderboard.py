@@ -0,0 +1,46 @@
+from typing import Dict, List, Optional
+
+from .skip_list import IndexableSkipList
+
+
+class Leaderboard:
+    def __init__(self):
+        self.scores: Dict[str, int] = {}
+        self.nicks: Dict[str, str] = {}
+        self.index = IndexableSkipList()
+
+    def add_points(self, player_id: str, nick: str, points: int):
+        old_score = self.scores.get(player_id)
+        if old_score is not None:
+            self.index.remove((-old_score, player_id))
+        new_score = (old_score or 0) + points
+        self.scores[player_id] = new_score
+        self.nicks[player_id] = nick
+        self.index.insert((-new_score, player_id))
+
+    def get_rank(self, player_id: str) -> Optional[int]:
+        score = self.scores.get(player_id)
+        if score is None:
+            return None
+        return self.index.rank((-score, player_id))
+
+    def get_player(self, player_id: str) -> Optional[dict]:
+        rank = self.get_rank(player_id)
+        if rank is None:
+            return None
+        return {"rank": rank,
+                "player_id": player_id,
+                "nick": self.nicks[player_id],
+                "score": self.scores[player_id]}
+
+    def top(self, count: int) -> List[dict]:
+        return [{"rank": rank,
+                 "player_id": player_id,
+                 "nick": self.nicks[player_id],
+                 "score": -negative_score}
+                for rank, (negative_score, player_id) in enumerate(self.index.first(count), start=1)]
+
+    def get_stats(self, count: int, player_id: Optional[str] = None):
+        return {"players_count": len(self.index),
+                "top": self.top(count),
+                "player": self.get_player(player_id) if player_id else None}
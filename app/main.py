@@ -1,18 +1,52 @@
-from typing import Optional
+import asyncio
+import hmac
+import os
+from typing import List, Optional
 
 import uvicorn
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Body, HTTPException
-from starlette.responses import JSONResponse
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Body, HTTPException, Header
+from starlette.responses import JSONResponse, PlainTextResponse
 
 from app.connection_manager import ConnectionManager
+from app.heartbeat import Heartbeat
 from app.models import GuessResult, PlayerGuess
+from app.profiler import LoopLagMonitor, SamplingProfiler
 from app.server_errors import GameNotStarted, PlayerIdAlreadyInUse, NoRoomWithThisId, RoomIdAlreadyInUse, \
-    LocaleNotSupported, NoPlayerWithThisId
+    LocaleNotSupported, NoPlayerWithThisId, RateLimitExceeded
 
 app = FastAPI()
 
 manager = ConnectionManager()
 
+heartbeat = Heartbeat(manager, interval=float(os.getenv('HEARTBEAT_INTERVAL', 15)),
+                      deadline=float(os.getenv('HEARTBEAT_DEADLINE', 0)))
+
+loop_lag_monitor = LoopLagMonitor(interval=float(os.getenv('LOOP_LAG_INTERVAL_MS', 100)) / 1000,
+                                  slow_callback_threshold=float(os.getenv('SLOW_CALLBACK_MS', 100)) / 1000)
+sampling_profiler = SamplingProfiler()
+
+
+def check_profiling_access(admin_token: Optional[str]):
+    profiling_token = os.getenv('PROFILING_TOKEN')
+    if not profiling_token:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if admin_token is None or not hmac.compare_digest(admin_token, profiling_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@app.on_event("startup")
+async def start_background_tasks():
+    heartbeat.start()
+    if os.getenv('PROFILING_TOKEN'):
+        loop_lag_monitor.start()
+
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    heartbeat.stop()
+    loop_lag_monitor.stop()
+    sampling_profiler.stop()
+
 
 @app.get("/")
 async def get():
@@ -25,6 +59,10 @@ async def make_a_guess(player_guess: PlayerGuess = Body(..., description="a gues
         response = await manager.handle_players_guess(player_guess)
     except GameNotStarted:
         raise HTTPException(status_code=404, detail=f"The game in room {player_guess.room_id} is not started")
+    except RateLimitExceeded:
+        raise HTTPException(status_code=429, detail=f"Too many guesses from player {player_guess.player_id}")
+    except NoPlayerWithThisId:
+        raise HTTPException(status_code=403, detail=f"No player with this id: {player_guess.player_id}")
     return response
 
 
@@ -41,6 +79,70 @@ async def get_stats(room_id: Optional[str] = None):
     return manager.get_overall_stats()
 
 
+@app.post("/stats/rooms")
+async def get_rooms_stats(room_ids: List[str] = Body(..., description="ids of rooms to get stats for")):
+    if len(room_ids) > 100:
+        return JSONResponse(
+            status_code=400,
+            content={"detail": "Too many room ids, max 100"}
+        )
+    return manager.get_rooms_stats(room_ids)
+
+
+@app.get("/rooms")
+async def list_rooms(cursor: Optional[str] = None, limit: int = 50, locale: Optional[str] = None,
+                     is_game_on: Optional[bool] = None, min_players: Optional[int] = None,
+                     max_players: Optional[int] = None):
+    try:
+        return manager.list_rooms(cursor, max(0, min(limit, 100)), locale, is_game_on, min_players, max_players)
+    except ValueError:
+        return JSONResponse(
+            status_code=400,
+            content={"detail": f"Invalid cursor: {cursor}"}
+        )
+
+
+@app.get("/leaderboard")
+async def get_leaderboard(room_id: Optional[str] = None, limit: int = 10, player_id: Optional[str] = None):
+    try:
+        return manager.get_leaderboard(room_id, max(0, min(limit, 100)), player_id)
+    except NoRoomWithThisId:
+        return JSONResponse(
+            status_code=403,
+            content={"detail": f"No room with this id: {room_id}"}
+        )
+
+
+@app.get("/stats/heartbeat")
+async def get_heartbeat_stats():
+    return heartbeat.get_stats()
+
+
+@app.get("/stats/rate_limits")
+async def get_rate_limit_stats():
+    return manager.get_rate_limit_stats()
+
+
+@app.get("/admin/profiling/loop_lag")
+async def get_loop_lag(x_admin_token: Optional[str] = Header(None)):
+    check_profiling_access(x_admin_token)
+    return loop_lag_monitor.get_stats()
+
+
+@app.post("/admin/profiling/start")
+async def start_profiler(interval_ms: float = 5, duration_s: float = 30, x_admin_token: Optional[str] = Header(None)):
+    check_profiling_access(x_admin_token)
+    sampling_profiler.start(interval=interval_ms / 1000, duration=duration_s)
+    return sampling_profiler.get_stats()
+
+
+@app.post("/admin/profiling/stop")
+async def stop_profiler(x_admin_token: Optional[str] = Header(None)):
+    check_profiling_access(x_admin_token)
+    collapsed_stacks = await asyncio.get_running_loop().run_in_executor(None, sampling_profiler.stop)
+    return PlainTextResponse(collapsed_stacks)
+
+
 @app.post("/room/new/{room_id}/{locale}")
 async def new_room(room_id: str, locale: str):
     try:
@@ -144,10 +246,11 @@ async def restart_game(room_id: str):
 @app.websocket("/ws/{room_id}/{client_id}/{nick}")
 async def websocket_endpoint(websocket: WebSocket, room_id: str, client_id: str, nick: str):
     try:
-        await manager.connect(websocket, room_id, client_id, nick)
+        connection = await manager.connect(websocket, room_id, client_id, nick)
         try:
             while True:
                 message = await websocket.receive()
+                connection.mark_alive()
                 await manager.handle_ws_message(message, room_id, client_id)
         except WebSocketDisconnect:
             print("disconnected")
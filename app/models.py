@@ -21,3 +21,5 @@ class GuessResult(BaseModel):
     clue: Optional[str]
     winner: Optional[str]
     drawer: Optional[str]
+    points: Optional[int]
+    drawer_points: Optional[int]
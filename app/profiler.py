@@ -0,0 +1,170 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from datetime import datetime
+from typing import Deque, Optional
+
+from .logger import setup_custom_logger
+
+logger = setup_custom_logger("profiler")
+
+
+class LoopLagMonitor:
+    """Samples event loop scheduling delay and records the loop thread's stack when it is blocked."""
+
+    def __init__(self, interval: float = 0.1, slow_callback_threshold: float = 0.1, history_size: int = 600):
+        self.interval = interval
+        self.slow_callback_threshold = slow_callback_threshold
+        self.lag_samples: Deque[float] = deque(maxlen=history_size)
+        self.slow_callbacks: Deque[dict] = deque(maxlen=50)
+        self.max_lag = 0.0
+        self.last_tick = time.monotonic()
+        self.loop_thread_id: Optional[int] = None
+        self.task: Optional[asyncio.Task] = None
+        self.watchdog: Optional[threading.Thread] = None
+        self.watchdog_stop_event = threading.Event()
+        self.running = False
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.loop_thread_id = threading.get_ident()
+        self.last_tick = time.monotonic()
+        self.task = asyncio.ensure_future(self.sample_lag())
+        self.watchdog_stop_event = threading.Event()
+        self.watchdog = threading.Thread(target=self.watch_loop, args=(self.watchdog_stop_event,),
+                                         name="loop-watchdog", daemon=True)
+        self.watchdog.start()
+
+    def stop(self):
+        self.running = False
+        self.watchdog_stop_event.set()
+        if self.watchdog is not None:
+            self.watchdog.join()
+            self.watchdog = None
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def sample_lag(self):
+        while self.running:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self.lag_samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            self.last_tick = now
+
+    def watch_loop(self, stop_event: threading.Event):
+        reported_tick = None
+        while not stop_event.wait(self.slow_callback_threshold / 2):
+            last_tick = self.last_tick
+            blocked_for = time.monotonic() - last_tick - self.interval
+            if blocked_for > self.slow_callback_threshold and reported_tick != last_tick:
+                reported_tick = last_tick
+                frame = sys._current_frames().get(self.loop_thread_id)
+                stack = traceback.format_stack(frame) if frame is not None else []
+                self.slow_callbacks.append({"detected_at": datetime.now().isoformat(),
+                                            "blocked_ms": round(blocked_for * 1000, 1),
+                                            "stack": stack})
+                logger.info(f"event loop blocked for {blocked_for * 1000:.0f} ms")
+
+    def get_stats(self):
+        samples = sorted(self.lag_samples)
+        return {"running": self.running,
+                "interval_ms": self.interval * 1000,
+                "slow_callback_threshold_ms": self.slow_callback_threshold * 1000,
+                "samples": len(samples),
+                "lag_ms": {"p50": round(percentile(samples, 0.5) * 1000, 2),
+                           "p99": round(percentile(samples, 0.99) * 1000, 2),
+                           "max": round(self.max_lag * 1000, 2)},
+                "slow_callbacks": list(self.slow_callbacks)}
+
+
+class SamplingProfiler:
+    """Periodically samples the stacks of all threads and aggregates them as collapsed stacks."""
+    min_interval = 0.005
+    max_interval = 0.1
+    max_duration = 300
+    truncated_stack = "[truncated]"
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 64, max_stacks: int = 10000):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.max_stacks = max_stacks
+        self.duration = 30.0
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.thread: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+        self.running = False
+        self.started_at: Optional[float] = None
+
+    def start(self, interval: Optional[float] = None, duration: Optional[float] = None):
+        if self.running:
+            return
+        if interval is not None:
+            self.interval = min(max(interval, self.min_interval), self.max_interval)
+        if duration is not None:
+            self.duration = min(max(duration, 0), self.max_duration)
+        self.stacks = Counter()
+        self.samples = 0
+        self.running = True
+        self.started_at = time.monotonic()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.sample, args=(self.stop_event,), name="sampling-profiler",
+                                       daemon=True)
+        self.thread.start()
+
+    def stop(self) -> str:
+        self.running = False
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        return self.get_collapsed_stacks()
+
+    def sample(self, stop_event: threading.Event):
+        own_thread_id = threading.get_ident()
+        deadline = time.monotonic() + self.duration
+        while not stop_event.is_set() and time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread_id:
+                    continue
+                stack = self.collapse(frame)
+                if stack not in self.stacks and len(self.stacks) >= self.max_stacks:
+                    stack = self.truncated_stack
+                self.stacks[stack] += 1
+            self.samples += 1
+            stop_event.wait(self.interval)
+        if stop_event is self.stop_event:
+            self.running = False
+
+    def collapse(self, frame) -> str:
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def get_collapsed_stacks(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def get_stats(self):
+        return {"running": self.running,
+                "interval_ms": self.interval * 1000,
+                "duration_s": self.duration,
+                "samples": self.samples,
+                "unique_stacks": len(self.stacks)}
+
+
+def percentile(sorted_samples, fraction: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * fraction))]
@@ -0,0 +1,108 @@
+import time
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+# message type -> (tokens refilled per second, bucket capacity)
+DEFAULT_PLAYER_BUDGETS: Dict[str, Tuple[float, float]] = {
+    "frame": (30, 60),
+    "text": (5, 10),
+    "chat": (2, 5),
+    "guess": (2, 5),
+    "other_move": (0.2, 1),
+}
+
+DEFAULT_ROOM_BUDGETS: Dict[str, Tuple[float, float]] = {
+    "frame": (60, 120),
+    "text": (20, 40),
+    "chat": (20, 40),
+    "guess": (20, 40),
+    "other_move": (0.5, 2),
+}
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "last_refill")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+
+    def refill(self, now: float):
+        if now > self.last_refill:
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+
+    def has_tokens(self, now: float, tokens: float = 1) -> bool:
+        self.refill(now)
+        return self.tokens >= tokens
+
+    def consume(self, now: float, tokens: float = 1) -> bool:
+        if self.has_tokens(now, tokens):
+            self.tokens -= tokens
+            return True
+        return False
+
+
+class RateLimiter:
+    def __init__(self, player_budgets: Optional[Dict[str, Tuple[float, float]]] = None,
+                 room_budgets: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.player_budgets = dict(DEFAULT_PLAYER_BUDGETS if player_budgets is None else player_budgets)
+        self.room_budgets = dict(DEFAULT_ROOM_BUDGETS if room_budgets is None else room_budgets)
+        self.player_buckets: Dict[Tuple[str, str], Dict[str, TokenBucket]] = {}
+        self.room_buckets: Dict[str, Dict[str, TokenBucket]] = {}
+        self.throttled_players: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self.throttled_total: Dict[str, int] = defaultdict(int)
+        self.allowed_total: Dict[str, int] = defaultdict(int)
+
+    def allow(self, room_id: str, player_id: str, message_type: str) -> bool:
+        now = time.monotonic()
+        buckets = [bucket for bucket in (
+            self.get_bucket(self.player_buckets, (room_id, player_id), self.player_budgets, message_type),
+            self.get_bucket(self.room_buckets, room_id, self.room_budgets, message_type)) if bucket is not None]
+        if not all(bucket.has_tokens(now) for bucket in buckets):
+            self.record_throttled(room_id, player_id, message_type)
+            return False
+        for bucket in buckets:
+            bucket.tokens -= 1
+        self.allowed_total[message_type] += 1
+        return True
+
+    @staticmethod
+    def get_bucket(buckets: dict, key, budgets: Dict[str, Tuple[float, float]],
+                   message_type: str) -> Optional[TokenBucket]:
+        budget = budgets.get(message_type)
+        if budget is None:
+            return None
+        buckets_for_key = buckets.setdefault(key, {})
+        bucket = buckets_for_key.get(message_type)
+        if bucket is None:
+            bucket = buckets_for_key[message_type] = TokenBucket(*budget)
+        return bucket
+
+    def record_throttled(self, room_id: str, player_id: str, message_type: str):
+        self.throttled_total[message_type] += 1
+        counters = self.throttled_players.setdefault((room_id, player_id), {})
+        counters[message_type] = counters.get(message_type, 0) + 1
+
+    def forget_player(self, room_id: str, player_id: str):
+        self.player_buckets.pop((room_id, player_id), None)
+        self.throttled_players.pop((room_id, player_id), None)
+
+    def forget_room(self, room_id: str):
+        self.room_buckets.pop(room_id, None)
+        for key in [key for key in self.player_buckets if key[0] == room_id]:
+            del self.player_buckets[key]
+        for key in [key for key in self.throttled_players if key[0] == room_id]:
+            del self.throttled_players[key]
+
+    def get_stats(self):
+        throttled_players = defaultdict(dict)
+        for (room_id, player_id), counters in self.throttled_players.items():
+            throttled_players[room_id][player_id] = dict(counters)
+        return {"player_budgets": self.player_budgets,
+                "room_budgets": self.room_budgets,
+                "allowed_total": dict(self.allowed_total),
+                "throttled_total": dict(self.throttled_total),
+                "throttled_players": dict(throttled_players)}
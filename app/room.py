@@ -8,15 +8,18 @@ from typing import List, Optional
 import requests
 from fuzzywuzzy import fuzz
 
+from .chat import Chat
 from .clue import ClueManager
 from .connection import Connection
+from .leaderboard import Leaderboard
 from .logger import setup_custom_logger
 from .models import PlayerGuess, GuessResult
 from .server_errors import GameNotStarted, NoPlayerWithThisId
+from .stats import ServerStats
 
 
 class Room:
-    def __init__(self, room_id, locale):
+    def __init__(self, room_id, locale, stats: Optional[ServerStats] = None):
         self.id = room_id
         self.active_connections: List[Connection] = []
         self.is_game_on = False
@@ -29,6 +32,16 @@ class Room:
         self.timer = threading.Timer(self.timeout, self.next_person_async)
         self.clue_manager = ClueManager(self.locale)
         self.used_words = []
+        self.chat = Chat()
+        self.leaderboard = Leaderboard()
+        self.guesser_points = 100
+        self.drawer_points = 50
+        self.max_time_bonus = 100
+        self.leaderboard_size_in_game_state = 3
+        self.stats = stats if stats is not None else ServerStats()
+        self.reaped_connections = 0
+        self.frame_broadcast_task: Optional[asyncio.Task] = None
+        self.send_timeout = 5
         self.logger = setup_custom_logger(f"room_{self.id}")
 
     def next_person_async(self):
@@ -37,6 +50,7 @@ class Room:
 
     async def append_connection(self, connection):
         self.active_connections.append(connection)
+        self.stats.player_connected()
         self.export_room_status()
         if len(self.active_connections) > 1 and self.is_game_on is False:
             await self.start_game()
@@ -59,6 +73,7 @@ class Room:
 
     async def remove_connection(self, connection_with_given_ws):
         self.active_connections.remove(connection_with_given_ws)
+        self.stats.player_disconnected()
         self.export_room_status()
         if len(self.active_connections) <= 1:
             await self.end_game()
@@ -75,6 +90,12 @@ class Room:
         else:
             self.logger.info(f"players clue mismatch: {players_message_stripped}, clue: {clue_stripped}")
 
+    def reveals_clue(self, message):
+        if not self.clue:
+            return False
+        clue_stripped = self.clue.lower().replace(",", "").replace(".", "")
+        return self.check_players_clue(message) or clue_stripped in message.lower().replace(",", "").replace(".", "")
+
     async def handle_players_guess(self, player_guess: PlayerGuess, score_thresh=60):
         score = fuzz.ratio(player_guess.message, self.clue)
 
@@ -84,20 +105,57 @@ class Room:
         if self.check_players_clue(player_guess.message):
             winning_clue = self.clue
             drawer = str(self.whos_turn)
+            guesser_points, drawer_points = self.score_win(player_guess.player_id, drawer)
             await self.restart_game()
-            return GuessResult(status="WIN", clue=winning_clue, winner=player_guess.player_id, drawer=drawer)
+            return GuessResult(status="WIN", clue=winning_clue, winner=player_guess.player_id, drawer=drawer,
+                               points=guesser_points, drawer_points=drawer_points)
 
         elif score > score_thresh:
             return GuessResult(status="IS_CLOSE")
         else:
             return GuessResult(status="MISS")
 
+    def get_points(self) -> (int, int):
+        remaining = max(0.0, (self.timestamp - datetime.now()).total_seconds())
+        time_bonus = int(self.max_time_bonus * min(remaining, self.timeout) / self.timeout)
+        return self.guesser_points + time_bonus, self.drawer_points + time_bonus // 2
+
+    def score_win(self, winner_id, drawer_id) -> (int, int):
+        if winner_id == drawer_id or winner_id not in self.get_players_ids():
+            return 0, 0
+        guesser_points, drawer_points = self.get_points()
+        self.leaderboard.add_points(winner_id, self.get_player_nick(winner_id), guesser_points)
+        self.leaderboard.add_points(drawer_id, self.get_player_nick(drawer_id), drawer_points)
+        return guesser_points, drawer_points
+
     async def broadcast(self):
+        leaderboard = self.leaderboard.top(self.leaderboard_size_in_game_state)
         for connection in self.active_connections:
-            gs = self.get_game_state(connection.player.id)
+            gs = self.get_game_state(connection.player.id, leaderboard)
             await connection.ws.send_text(gs)
             await connection.ws.send_bytes(self.game_data)
 
+    async def broadcast_text(self, text: str):
+        await asyncio.gather(*(self.send_text(connection, text) for connection in list(self.active_connections)))
+
+    async def send_text(self, connection: Connection, text: str):
+        try:
+            await asyncio.wait_for(connection.ws.send_text(text), timeout=self.send_timeout)
+        except Exception as e:
+            self.logger.info(f"failed to send to {connection.player.id}: {e.__class__.__name__}")
+
+    async def handle_chat_message(self, client_id, text):
+        try:
+            player = next(
+                connection.player for connection in self.active_connections if connection.player.id == client_id)
+        except StopIteration:
+            raise NoPlayerWithThisId
+        if self.reveals_clue(str(text)):
+            self.logger.info(f"dropping chat message revealing the clue from {client_id}: {text}")
+            return
+        if self.chat.add_message(player, text) is not None:
+            self.chat.schedule_flush(self.broadcast_text)
+
     async def restart_or_end_game(self):
         if len(self.active_connections) >= 2:
             await self.restart_game()
@@ -110,31 +168,40 @@ class Room:
     async def start_game(self):
         self.whos_turn = self.next_person_move()
         self.game_data = bytearray()
+        if not self.is_game_on:
+            self.stats.game_started()
+        self.stats.turn_started()
         self.is_game_on = True
         self.category, self.clue = self.clue_manager.get_new_clue()
         self.restart_timer()
         await self.broadcast()
 
     async def end_game(self):
+        if self.is_game_on:
+            self.stats.game_ended()
         self.is_game_on = False
         self.whos_turn = None
         self.clue = None
         self.category = None
         await self.broadcast()
 
-    def get_game_state(self, client_id) -> str:
+    def get_game_state(self, client_id, leaderboard: Optional[list] = None) -> str:
+        if leaderboard is None:
+            leaderboard = self.leaderboard.top(self.leaderboard_size_in_game_state)
         if client_id == self.whos_turn:
             game_state = {
                 "is_game_on": self.is_game_on,
                 "whos_turn": self.whos_turn,
                 "sequence_to_guess": self.clue + f" \ncategory: {self.category}",
                 "timestamp": self.timestamp.isoformat(),
+                "leaderboard": leaderboard,
             }
         else:
             game_state = {
                 "is_game_on": self.is_game_on,
                 "whos_turn": self.whos_turn,
                 "drawer": self.get_guesser_ui_text(),
+                "leaderboard": leaderboard,
             }
             if self.is_game_on is True:
                 game_state["timestamp"] = self.timestamp.isoformat()
@@ -157,11 +224,18 @@ class Room:
             new_id = players_ids[0]
         return new_id
 
+    def get_summary(self):
+        return {"room_id": self.id,
+                "locale": self.locale,
+                "is_game_on": self.is_game_on,
+                "number_of_connected_players": len(self.active_connections)}
+
     def get_stats(self):
         return {"is_game_on": self.is_game_on,
                 "whos_turn": self.whos_turn,
                 "number_of_connected_players": len(self.active_connections),
                 "players_ids": self.get_players_ids(),
+                "reaped_connections": self.reaped_connections,
                 "clue": self.clue}
 
     def restart_timer(self):
@@ -198,6 +272,20 @@ class Room:
             self.logger.info(e.__class__.__name__)
             self.logger.info("failed to get EXPORT_RESULTS_URL env var")
 
+    def get_connection(self, player_id) -> Connection:
+        try:
+            return next(connection for connection in self.active_connections if connection.player.id == player_id)
+        except StopIteration:
+            raise NoPlayerWithThisId
+
+    def get_player_nick(self, player_id) -> str:
+        try:
+            return next(
+                connection.player.nick for connection in self.active_connections if
+                connection.player.id == player_id)
+        except StopIteration:
+            return self.leaderboard.nicks.get(player_id, str(player_id))
+
     def get_guesser_ui_text(self):
         try:
             player_nick = next(
@@ -31,3 +31,8 @@ class RoomIdAlreadyInUse(WsServerError):
 class LocaleNotSupported(WsServerError):
     def __init__(self):
         self.message = 'Locale not supported'
+
+
+class RateLimitExceeded(WsServerError):
+    def __init__(self):
+        self.message = 'Too many requests'
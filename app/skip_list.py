@@ -0,0 +1,112 @@
+import random
+from typing import List, Optional
+
+
+class SkipListNode:
+    __slots__ = ("key", "forward", "span")
+
+    def __init__(self, key, level: int):
+        self.key = key
+        self.forward: List[Optional[SkipListNode]] = [None] * level
+        self.span: List[int] = [0] * level
+
+
+class IndexableSkipList:
+    """Sorted keys with O(log n) insert, remove and rank lookup (spans as in Redis sorted sets)."""
+    max_level = 32
+    p = 0.25
+
+    def __init__(self):
+        self.head = SkipListNode(None, self.max_level)
+        self.level = 1
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def random_level(self) -> int:
+        level = 1
+        while random.random() < self.p and level < self.max_level:
+            level += 1
+        return level
+
+    def insert(self, key):
+        update = [self.head] * self.max_level
+        rank = [0] * self.max_level
+        x = self.head
+        for i in reversed(range(self.level)):
+            rank[i] = 0 if i == self.level - 1 else rank[i + 1]
+            while x.forward[i] is not None and x.forward[i].key < key:
+                rank[i] += x.span[i]
+                x = x.forward[i]
+            update[i] = x
+
+        level = self.random_level()
+        if level > self.level:
+            for i in range(self.level, level):
+                rank[i] = 0
+                update[i] = self.head
+                self.head.span[i] = self.size
+            self.level = level
+
+        node = SkipListNode(key, level)
+        for i in range(level):
+            node.forward[i] = update[i].forward[i]
+            update[i].forward[i] = node
+            node.span[i] = update[i].span[i] - (rank[0] - rank[i])
+            update[i].span[i] = rank[0] - rank[i] + 1
+        for i in range(level, self.level):
+            update[i].span[i] += 1
+        self.size += 1
+
+    def remove(self, key):
+        update = [self.head] * self.max_level
+        x = self.head
+        for i in reversed(range(self.level)):
+            while x.forward[i] is not None and x.forward[i].key < key:
+                x = x.forward[i]
+            update[i] = x
+
+        x = x.forward[0]
+        if x is None or x.key != key:
+            raise KeyError(key)
+        for i in range(self.level):
+            if update[i].forward[i] is x:
+                update[i].span[i] += x.span[i] - 1
+                update[i].forward[i] = x.forward[i]
+            else:
+                update[i].span[i] -= 1
+        while self.level > 1 and self.head.forward[self.level - 1] is None:
+            self.level -= 1
+        self.size -= 1
+
+    def rank(self, key) -> Optional[int]:
+        """1-based position of key, or None if it is not in the list."""
+        rank = 0
+        x = self.head
+        for i in reversed(range(self.level)):
+            while x.forward[i] is not None and x.forward[i].key <= key:
+                rank += x.span[i]
+                x = x.forward[i]
+            if x is not self.head and x.key == key:
+                return rank
+        return None
+
+    def iter_after(self, key):
+        """Yields keys greater than key in order; finding the start is O(log n)."""
+        x = self.head
+        for i in reversed(range(self.level)):
+            while x.forward[i] is not None and x.forward[i].key <= key:
+                x = x.forward[i]
+        x = x.forward[0]
+        while x is not None:
+            yield x.key
+            x = x.forward[0]
+
+    def first(self, count: int) -> list:
+        keys = []
+        x = self.head.forward[0]
+        while x is not None and len(keys) < count:
+            keys.append(x.key)
+            x = x.forward[0]
+        return keys
@@ -0,0 +1,62 @@
+import time
+from collections import Counter, deque
+from typing import Deque
+
+
+class ServerStats:
+    """Global aggregates updated incrementally by rooms, so reading them is O(1)."""
+
+    def __init__(self, turns_window: float = 60):
+        self.rooms_per_locale: Counter = Counter()
+        self.active_games = 0
+        self.connected_players = 0
+        self.reaped_connections = 0
+        self.turns_window = turns_window
+        self.turn_timestamps: Deque[float] = deque()
+
+    def room_created(self, locale: str):
+        self.rooms_per_locale[locale] += 1
+
+    def room_deleted(self, locale: str, connected_players: int, is_game_on: bool):
+        self.rooms_per_locale[locale] -= 1
+        if self.rooms_per_locale[locale] <= 0:
+            del self.rooms_per_locale[locale]
+        self.connected_players -= connected_players
+        if is_game_on:
+            self.active_games -= 1
+
+    def player_connected(self):
+        self.connected_players += 1
+
+    def player_disconnected(self):
+        self.connected_players -= 1
+
+    def connection_reaped(self):
+        self.reaped_connections += 1
+
+    def game_started(self):
+        self.active_games += 1
+
+    def game_ended(self):
+        self.active_games -= 1
+
+    def turn_started(self):
+        now = time.monotonic()
+        self.turn_timestamps.append(now)
+        self.prune_turns(now)
+
+    def prune_turns(self, now: float):
+        while self.turn_timestamps and self.turn_timestamps[0] < now - self.turns_window:
+            self.turn_timestamps.popleft()
+
+    def get_turns_per_minute(self) -> float:
+        self.prune_turns(time.monotonic())
+        return len(self.turn_timestamps) * 60 / self.turns_window
+
+    def get_stats(self):
+        return {"rooms_count": sum(self.rooms_per_locale.values()),
+                "rooms_per_locale": dict(self.rooms_per_locale),
+                "active_games": self.active_games,
+                "connected_players": self.connected_players,
+                "reaped_connections": self.reaped_connections,
+                "turns_per_minute": self.get_turns_per_minute()}
@@ -0,0 +1,56 @@
+import asyncio
+import json
+import os
+import time
+import unittest
+
+from app.connection import Connection
+from app.player import Player
+from app.room import Room
+from app.test.fake_websocket import FakeWebSocket
+
+PLAYERS = 50
+MESSAGES = 20000
+MESSAGES_PER_FLUSH = 100
+
+
+@unittest.skipUnless(os.getenv('RUN_BENCHMARKS'), "set RUN_BENCHMARKS=1 to run")
+class ChatBenchmarkTest(unittest.TestCase):
+    def setUp(self):
+        self.room = Room("benchmark", "en")
+        self.sockets = [FakeWebSocket() for _ in range(PLAYERS)]
+        self.room.active_connections = [Connection(ws=ws, player=Player(player_id=str(idx), nick=f"nick{idx}"))
+                                        for idx, ws in enumerate(self.sockets)]
+
+    def sent_frames(self):
+        return sum(len(ws.sent_text) for ws in self.sockets)
+
+    def test_coalesced_fan_out(self):
+        async def send_messages():
+            for idx in range(MESSAGES):
+                self.room.chat.add_message(self.room.active_connections[idx % PLAYERS].player, f"message {idx}")
+                if idx % MESSAGES_PER_FLUSH == MESSAGES_PER_FLUSH - 1:
+                    await self.room.broadcast_text(self.room.chat.pop_pending_frame())
+
+        started = time.perf_counter()
+        asyncio.run(send_messages())
+        elapsed = time.perf_counter() - started
+        print(f"\ncoalesced: {MESSAGES / elapsed:.0f} msg/s, {self.sent_frames()} sends")
+        self.assertEqual(self.sent_frames(), MESSAGES // MESSAGES_PER_FLUSH * PLAYERS)
+
+    def test_per_message_fan_out(self):
+        async def send_messages():
+            for idx in range(MESSAGES):
+                message = self.room.chat.add_message(self.room.active_connections[idx % PLAYERS].player,
+                                                     f"message {idx}")
+                await self.room.broadcast_text(json.dumps({"chat": [message]}))
+
+        started = time.perf_counter()
+        asyncio.run(send_messages())
+        elapsed = time.perf_counter() - started
+        print(f"\nper message: {MESSAGES / elapsed:.0f} msg/s, {self.sent_frames()} sends")
+        self.assertEqual(self.sent_frames(), MESSAGES * PLAYERS)
+
+
+if __name__ == '__main__':
+    unittest.main()
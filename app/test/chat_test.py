@@ -1,9 +1,120 @@
+import asyncio
+import json
 import unittest
 
+from app.chat import Chat
+from app.connection import Connection
+from app.player import Player
+from app.room import Room
+from app.test.fake_websocket import FakeWebSocket
+
 
 class ChatTest(unittest.TestCase):
-    def test_something(self):
-        self.assertEqual(True, False)
+    def test_history_is_bounded(self):
+        # given
+        chat = Chat(history_size=5)
+        player = Player(player_id="1", nick="nick")
+        # when
+        for idx in range(20):
+            chat.add_message(player, f"message {idx}")
+        # then
+        history = json.loads(chat.get_history_frame())["chat_history"]
+        self.assertEqual(len(history), 5)
+        self.assertEqual(history[0]["message"], "message 15")
+        self.assertEqual(history[-1]["message"], "message 19")
+
+    def test_empty_message_is_dropped(self):
+        chat = Chat()
+        self.assertIsNone(chat.add_message(Player(player_id="1", nick="nick"), "   "))
+        self.assertIsNone(chat.get_history_frame())
+
+    def test_messages_are_coalesced_into_one_frame(self):
+        # given
+        room = Room("chat", "en")
+        room.chat.flush_interval = 0.01
+        sockets = [FakeWebSocket() for _ in range(50)]
+        room.active_connections = [Connection(ws=ws, player=Player(player_id=str(idx), nick=f"nick{idx}"))
+                                   for idx, ws in enumerate(sockets)]
+
+        async def send_messages():
+            for idx in range(50):
+                await room.handle_chat_message(str(idx), f"hello from {idx}")
+            await room.chat.flush_task
+
+        # when
+        asyncio.run(send_messages())
+        # then
+        for ws in sockets:
+            self.assertEqual(len(ws.sent_text), 1)
+            self.assertEqual(len(json.loads(ws.sent_text[0])["chat"]), 50)
+
+    def test_message_sent_during_flush_is_delivered(self):
+        # given
+        room = Room("chat", "en")
+        room.chat.flush_interval = 0.01
+        ws = FakeWebSocket(send_delay=0.05)
+        room.active_connections = [Connection(ws=ws, player=Player(player_id="1", nick="nick"))]
+
+        async def send_messages():
+            await room.handle_chat_message("1", "first")
+            await asyncio.sleep(0.03)
+            await room.handle_chat_message("1", "second")
+            await room.chat.flush_task
+
+        # when
+        asyncio.run(send_messages())
+        # then
+        messages = [message["message"] for frame in ws.sent_text for message in json.loads(frame)["chat"]]
+        self.assertEqual(messages, ["first", "second"])
+
+    def test_pending_messages_are_bounded(self):
+        chat = Chat(history_size=5)
+        player = Player(player_id="1", nick="nick")
+        for idx in range(20):
+            chat.add_message(player, f"message {idx}")
+        self.assertEqual(len(json.loads(chat.pop_pending_frame())["chat"]), 5)
+
+    def test_slow_recipient_does_not_block_others(self):
+        # given
+        room = Room("chat", "en")
+        room.send_timeout = 0.05
+        slow, fast = FakeWebSocket(send_delay=10), FakeWebSocket()
+        room.active_connections = [Connection(ws=slow, player=Player(player_id="1", nick="slow")),
+                                   Connection(ws=fast, player=Player(player_id="2", nick="fast"))]
+
+        async def broadcast():
+            started = asyncio.get_running_loop().time()
+            await room.broadcast_text("hello")
+            return asyncio.get_running_loop().time() - started
+
+        # when
+        elapsed = asyncio.run(broadcast())
+        # then
+        self.assertEqual(fast.sent_text, ["hello"])
+        self.assertLess(elapsed, 1)
+
+    def test_drawer_cannot_reveal_clue(self):
+        # given
+        room = Room("chat", "en")
+        room.active_connections = [Connection(ws=FakeWebSocket(), player=Player(player_id="1", nick="nick"))]
+        room.whos_turn = "1"
+        room.clue = "Big apple"
+        # when
+        asyncio.run(room.handle_chat_message("1", "it is a big apple!"))
+        # then
+        self.assertIsNone(room.chat.get_history_frame())
+
+    def test_guesser_cannot_reveal_clue(self):
+        # given
+        room = Room("chat", "en")
+        room.active_connections = [Connection(ws=FakeWebSocket(), player=Player(player_id=player_id, nick=player_id))
+                                   for player_id in ["1", "2"]]
+        room.whos_turn = "1"
+        room.clue = "Big apple"
+        # when
+        asyncio.run(room.handle_chat_message("2", "big apple"))
+        # then
+        self.assertIsNone(room.chat.get_history_frame())
 
 
 if __name__ == '__main__':
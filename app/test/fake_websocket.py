@@ -0,0 +1,26 @@
+import asyncio
+
+
+class FakeWebSocket:
+    def __init__(self, send_delay: float = 0, fail: bool = False):
+        self.send_delay = send_delay
+        self.fail = fail
+        self.sent_text = []
+        self.sent_bytes = []
+        self.closed = False
+
+    async def send_text(self, text):
+        await self.send(self.sent_text, text)
+
+    async def send_bytes(self, data):
+        await self.send(self.sent_bytes, data)
+
+    async def send(self, sent, data):
+        if self.fail:
+            raise RuntimeError("connection lost")
+        if self.send_delay:
+            await asyncio.sleep(self.send_delay)
+        sent.append(data)
+
+    async def close(self, code=1000):
+        self.closed = True
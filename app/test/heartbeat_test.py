@@ -0,0 +1,90 @@
+import asyncio
+import json
+import time
+import unittest
+
+from app.connection import Connection
+from app.connection_manager import ConnectionManager
+from app.heartbeat import Heartbeat
+from app.models import PlayerGuess
+from app.player import Player
+from app.server_errors import GameNotStarted
+from app.test.fake_websocket import FakeWebSocket
+
+
+class HeartbeatTest(unittest.TestCase):
+    def test_dead_connections_are_reaped(self):
+        # given
+        manager = ConnectionManager()
+        heartbeat = Heartbeat(manager, interval=1, deadline=30)
+        room = manager.get_room("1")
+        alive, silent, broken = FakeWebSocket(), FakeWebSocket(), FakeWebSocket(fail=True)
+        connections = [Connection(ws=ws, player=Player(player_id=str(idx), nick=str(idx)))
+                       for idx, ws in enumerate([alive, silent, broken])]
+        connections[1].last_seen = time.monotonic() - 60
+        connections[1].answers_pings = True
+
+        async def scenario():
+            for connection in connections:
+                room.active_connections.append(connection)
+                room.stats.player_connected()
+            await heartbeat.tick()
+
+        # when
+        asyncio.run(scenario())
+        # then
+        self.assertEqual(room.active_connections, [connections[0]])
+        self.assertEqual(json.loads(alive.sent_text[0]), {"ping": 1})
+        self.assertTrue(silent.closed)
+        self.assertTrue(broken.closed)
+        self.assertEqual(manager.get_overall_stats()["reaped_connections"], 2)
+        self.assertEqual(manager.get_overall_stats()["connected_players"], 1)
+        self.assertEqual(room.get_stats()["reaped_connections"], 2)
+        self.assertEqual(heartbeat.get_stats()["failed_pings"], 1)
+
+    def test_idle_healthy_connection_survives_default_settings(self):
+        # given
+        manager = ConnectionManager()
+        heartbeat = Heartbeat(manager)
+        room = manager.get_room("1")
+        ws = FakeWebSocket()
+        connection = Connection(ws=ws, player=Player(player_id="1", nick="1"))
+        connection.last_seen = time.monotonic() - 46
+        room.active_connections.append(connection)
+        # when
+        asyncio.run(heartbeat.tick())
+        # then
+        self.assertEqual(room.active_connections, [connection])
+        self.assertFalse(ws.closed)
+
+    def test_deadline_skips_clients_that_never_answered_a_ping(self):
+        # given
+        manager = ConnectionManager()
+        heartbeat = Heartbeat(manager, deadline=30)
+        room = manager.get_room("1")
+        connection = Connection(ws=FakeWebSocket(), player=Player(player_id="1", nick="1"))
+        connection.last_seen = time.monotonic() - 60
+        room.active_connections.append(connection)
+        # when
+        asyncio.run(heartbeat.tick())
+        asyncio.run(manager.handle_ws_message({"text": json.dumps({"pong": 1})}, "1", "1"))
+        # then
+        self.assertEqual(room.active_connections, [connection])
+        self.assertTrue(connection.answers_pings)
+
+    def test_guess_keeps_connection_alive(self):
+        # given
+        manager = ConnectionManager()
+        room = manager.get_room("1")
+        connection = Connection(ws=FakeWebSocket(), player=Player(player_id="1", nick="1"))
+        connection.last_seen = time.monotonic() - 60
+        room.active_connections.append(connection)
+        # when
+        with self.assertRaises(GameNotStarted):
+            asyncio.run(manager.handle_players_guess(PlayerGuess(player_id="1", room_id="1", message="guess")))
+        # then
+        self.assertLess(time.monotonic() - connection.last_seen, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
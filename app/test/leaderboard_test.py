@@ -0,0 +1,65 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+
+from app.connection import Connection
+from app.leaderboard import Leaderboard
+from app.player import Player
+from app.room import Room
+from app.skip_list import IndexableSkipList
+
+
+class LeaderboardTest(unittest.TestCase):
+    def test_skip_list_matches_sorted_list(self):
+        # given
+        skip_list = IndexableSkipList()
+        expected = []
+        keys = random.sample(range(10000), 2000)
+        # when
+        for key in keys:
+            skip_list.insert(key)
+            expected.append(key)
+        for key in keys[:1000]:
+            skip_list.remove(key)
+            expected.remove(key)
+        expected.sort()
+        # then
+        self.assertEqual(len(skip_list), len(expected))
+        self.assertEqual(skip_list.first(len(expected) + 1), expected)
+        for idx, key in enumerate(expected):
+            self.assertEqual(skip_list.rank(key), idx + 1)
+        self.assertIsNone(skip_list.rank(keys[0]))
+
+    def test_ranking_players(self):
+        # given
+        leaderboard = Leaderboard()
+        # when
+        leaderboard.add_points("1", "first", 100)
+        leaderboard.add_points("2", "second", 150)
+        leaderboard.add_points("3", "third", 50)
+        leaderboard.add_points("1", "first", 100)
+        # then
+        self.assertEqual([entry["player_id"] for entry in leaderboard.top(3)], ["1", "2", "3"])
+        self.assertEqual(leaderboard.top(1)[0]["score"], 200)
+        self.assertEqual(leaderboard.get_rank("3"), 3)
+        self.assertEqual(leaderboard.get_player("2")["rank"], 2)
+        self.assertIsNone(leaderboard.get_player("4"))
+
+    def test_only_connected_players_score(self):
+        # given
+        room = Room("scores", "en")
+        room.active_connections = [Connection(ws=None, player=Player(player_id=player_id, nick=player_id))
+                                   for player_id in ["drawer", "guesser"]]
+        room.timestamp = datetime.now() + timedelta(0, room.timeout)
+        # when
+        sockpuppet_points = room.score_win("sockpuppet", "drawer")
+        guesser_points = room.score_win("guesser", "drawer")
+        # then
+        self.assertEqual(sockpuppet_points, (0, 0))
+        self.assertGreater(guesser_points[0], 0)
+        self.assertIsNone(room.leaderboard.get_rank("sockpuppet"))
+        self.assertEqual(room.leaderboard.get_rank("guesser"), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import asyncio
+import time
+import unittest
+
+from app.profiler import LoopLagMonitor, SamplingProfiler
+
+
+class ProfilerTest(unittest.TestCase):
+    def test_blocking_call_is_detected(self):
+        # given
+        monitor = LoopLagMonitor(interval=0.02, slow_callback_threshold=0.05)
+
+        async def block_loop():
+            monitor.start()
+            await asyncio.sleep(0.1)
+            time.sleep(0.3)
+            await asyncio.sleep(0.1)
+            monitor.stop()
+
+        # when
+        asyncio.run(block_loop())
+        stats = monitor.get_stats()
+        # then
+        self.assertGreater(stats["lag_ms"]["max"], 200)
+        self.assertEqual(len(stats["slow_callbacks"]), 1)
+        self.assertIn("block_loop", stats["slow_callbacks"][0]["stack"][-1])
+
+    def test_sampling_profiler_returns_collapsed_stacks(self):
+        # given
+        profiler = SamplingProfiler(interval=0.005)
+        # when
+        profiler.start()
+        time.sleep(0.05)
+        collapsed = profiler.stop()
+        # then
+        self.assertGreater(profiler.samples, 0)
+        for line in collapsed.splitlines():
+            stack, count = line.rsplit(" ", 1)
+            self.assertTrue(stack)
+            self.assertGreater(int(count), 0)
+
+    def test_stop_does_not_wait_for_long_interval(self):
+        # given
+        profiler = SamplingProfiler()
+        profiler.start(interval=3)
+        time.sleep(0.01)
+        # when
+        started = time.monotonic()
+        profiler.stop()
+        # then
+        self.assertEqual(profiler.interval, SamplingProfiler.max_interval)
+        self.assertLess(time.monotonic() - started, 0.05)
+
+    def test_profiler_stops_after_duration(self):
+        # given
+        profiler = SamplingProfiler(max_stacks=1)
+        # when
+        profiler.start(duration=0.05)
+        profiler.thread.join(timeout=1)
+        # then
+        self.assertFalse(profiler.running)
+        self.assertLessEqual(len(profiler.stacks), 2)
+
+    def test_restarted_monitor_runs_one_watchdog(self):
+        # given
+        monitor = LoopLagMonitor(interval=0.02, slow_callback_threshold=0.05)
+
+        async def restart():
+            monitor.start()
+            first_watchdog = monitor.watchdog
+            monitor.stop()
+            monitor.start()
+            monitor.stop()
+            return first_watchdog
+
+        # when
+        first_watchdog = asyncio.run(restart())
+        # then
+        self.assertFalse(first_watchdog.is_alive())
+        self.assertIsNone(monitor.watchdog)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import unittest
+
+from app.connection import Connection
+from app.connection_manager import ConnectionManager
+from app.models import PlayerGuess
+from app.player import Player
+from app.rate_limit import RateLimiter, TokenBucket
+from app.server_errors import NoPlayerWithThisId
+from app.test.fake_websocket import FakeWebSocket
+
+
+class RateLimitTest(unittest.TestCase):
+    def test_bucket_refills_over_time(self):
+        # given
+        bucket = TokenBucket(rate=1, capacity=2)
+        now = bucket.last_refill
+        # when / then
+        self.assertTrue(bucket.consume(now))
+        self.assertTrue(bucket.consume(now))
+        self.assertFalse(bucket.consume(now))
+        self.assertTrue(bucket.consume(now + 1))
+
+    def test_player_is_throttled(self):
+        # given
+        limiter = RateLimiter(player_budgets={"guess": (0, 3)}, room_budgets={})
+        # when
+        results = [limiter.allow("1", "player", "guess") for _ in range(5)]
+        # then
+        self.assertEqual(results, [True, True, True, False, False])
+        self.assertEqual(limiter.get_stats()["throttled_players"]["1"]["player"], {"guess": 2})
+        self.assertTrue(limiter.allow("1", "other_player", "guess"))
+
+    def test_room_budget_is_shared(self):
+        # given
+        limiter = RateLimiter(player_budgets={}, room_budgets={"chat": (0, 2)})
+        # when
+        results = [limiter.allow("1", str(idx), "chat") for idx in range(3)]
+        # then
+        self.assertEqual(results, [True, True, False])
+        self.assertTrue(limiter.allow("2", "0", "chat"))
+
+    def test_rejected_message_does_not_cost_tokens(self):
+        # given
+        limiter = RateLimiter(player_budgets={"chat": (0, 2)}, room_budgets={"chat": (0, 1)})
+        # when
+        results = [limiter.allow("1", "player", "chat") for _ in range(2)]
+        # then
+        self.assertEqual(results, [True, False])
+        self.assertEqual(limiter.player_buckets[("1", "player")]["chat"].tokens, 1)
+
+    def test_non_drawer_messages_do_not_use_room_budget(self):
+        # given
+        manager = ConnectionManager()
+        room = manager.get_room("1")
+        room.whos_turn = "drawer"
+        skip = {"text": json.dumps({"other_move": {"type": "skip"}})}
+        # when
+        for player_id in ["1", "2", "3"]:
+            asyncio.run(manager.handle_ws_message(skip, "1", player_id))
+        # then
+        self.assertNotIn("1", manager.rate_limiter.room_buckets)
+        self.assertTrue(manager.rate_limiter.allow("1", "drawer", "other_move"))
+
+    def test_last_throttled_frame_reaches_players(self):
+        # given
+        manager = ConnectionManager()
+        manager.rate_limiter = RateLimiter(player_budgets={"frame": (0, 2)}, room_budgets={})
+        manager.throttled_frame_delay = 0.01
+        room = manager.get_room("1")
+        room.whos_turn = "drawer"
+        guesser = FakeWebSocket()
+        room.active_connections = [Connection(ws=FakeWebSocket(), player=Player(player_id="drawer", nick="drawer")),
+                                   Connection(ws=guesser, player=Player(player_id="guesser", nick="guesser"))]
+
+        async def draw():
+            for idx in range(5):
+                await manager.handle_ws_message({"bytes": f"canvas{idx}".encode()}, "1", "drawer")
+            await room.frame_broadcast_task
+
+        # when
+        asyncio.run(draw())
+        # then
+        self.assertEqual(room.game_data, b"canvas4")
+        self.assertEqual(guesser.sent_bytes, [b"canvas0", b"canvas1", b"canvas4"])
+
+    def test_guess_from_unknown_player_is_rejected(self):
+        # given
+        manager = ConnectionManager()
+        guess = PlayerGuess(player_id="random", room_id="1", message="guess")
+        # when / then
+        with self.assertRaises(NoPlayerWithThisId):
+            asyncio.run(manager.handle_players_guess(guess))
+        self.assertEqual(manager.rate_limiter.player_buckets, {})
+
+    def test_forgetting_player_clears_counters(self):
+        # given
+        limiter = RateLimiter(player_budgets={"guess": (0, 0)}, room_budgets={})
+        limiter.allow("1", "player", "guess")
+        limiter.allow("2", "player", "guess")
+        # when
+        limiter.forget_player("1", "player")
+        limiter.forget_room("2")
+        # then
+        self.assertEqual(limiter.player_buckets, {})
+        self.assertEqual(limiter.throttled_players, {})
+
+    def test_unknown_message_type_is_not_limited(self):
+        limiter = RateLimiter(player_budgets={}, room_budgets={})
+        self.assertTrue(all(limiter.allow("1", "player", "frame") for _ in range(1000)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import asyncio
+import unittest
+
+from app.connection import Connection
+from app.connection_manager import ConnectionManager
+from app.player import Player
+from app.test.fake_websocket import FakeWebSocket
+
+
+class StatsTest(unittest.TestCase):
+    def test_aggregates_follow_rooms_and_players(self):
+        # given
+        manager = ConnectionManager()
+
+        async def scenario():
+            await manager.create_new_room("2", "en")
+            await manager.create_new_room("3", "en")
+            room = manager.get_room("2")
+            await room.append_connection(Connection(ws=FakeWebSocket(), player=Player(player_id="1", nick="one")))
+            await room.append_connection(Connection(ws=FakeWebSocket(), player=Player(player_id="2", nick="two")))
+            room.timer.cancel()
+            await manager.delete_room("3")
+
+        # when
+        asyncio.run(scenario())
+        stats = manager.get_overall_stats()
+        # then
+        self.assertEqual(stats["rooms_count"], 2)
+        self.assertEqual(stats["rooms_ids"], ["1", "2"])
+        self.assertEqual(stats["rooms_per_locale"], {"pl": 1, "en": 1})
+        self.assertEqual(stats["active_games"], 1)
+        self.assertEqual(stats["connected_players"], 2)
+        self.assertEqual(stats["turns_per_minute"], 1)
+
+    def test_deleted_room_stops_reporting(self):
+        # given
+        manager = ConnectionManager()
+
+        async def scenario():
+            await manager.create_new_room("2", "en")
+            room = manager.get_room("2")
+            await room.append_connection(Connection(ws=FakeWebSocket(), player=Player(player_id="1", nick="one")))
+            await room.append_connection(Connection(ws=FakeWebSocket(), player=Player(player_id="2", nick="two")))
+            await manager.delete_room("2")
+            await room.end_game()
+            return room
+
+        # when
+        room = asyncio.run(scenario())
+        stats = manager.get_overall_stats()
+        # then
+        self.assertTrue(room.timer.finished.is_set())
+        self.assertEqual(stats["active_games"], 0)
+        self.assertEqual(stats["connected_players"], 0)
+
+    def test_listing_rooms_with_cursor(self):
+        # given
+        manager = ConnectionManager()
+        for idx in range(2, 12):
+            asyncio.run(manager.create_new_room(str(idx), "en" if idx % 2 else "pl"))
+        asyncio.run(manager.delete_room("4"))
+        # when
+        first_page = manager.list_rooms(limit=3, locale="pl")
+        second_page = manager.list_rooms(cursor=first_page["next_cursor"], limit=3, locale="pl")
+        # then
+        self.assertEqual([r["room_id"] for r in first_page["rooms"]], ["1", "2", "6"])
+        self.assertEqual([r["room_id"] for r in second_page["rooms"]], ["8", "10"])
+        self.assertIsNone(second_page["next_cursor"])
+        self.assertEqual(manager.list_rooms(min_players=1)["rooms"], [])
+
+    def test_bulk_room_stats(self):
+        manager = ConnectionManager()
+        stats = manager.get_rooms_stats(["1", "missing"])
+        self.assertEqual(stats["1"]["number_of_connected_players"], 0)
+        self.assertIsNone(stats["missing"])
+
+
+if __name__ == '__main__':
+    unittest.main()